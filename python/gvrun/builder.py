@@ -20,14 +20,11 @@
 
 # For python 3.12
 from __future__ import annotations
+import os
 import threading
-try:
-    from typing import override  # Python 3.12+
-except ImportError:
-    from typing_extensions import override  # Python 3.10–3.11
-import psutil
-import queue
+import traceback
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 
 class CommandInterface(ABC):
 
@@ -41,56 +38,66 @@ class CommandInterface(ABC):
 
 class Builder():
 
-    class BuilderWorker(threading.Thread):
-
-        def __init__(self, builder: Builder):
-            super().__init__()
-
-            self.builder: Builder = builder
-
-        @override
-        def run(self):
-            while True:
-                test: CommandInterface|None = self.builder.pop_command()
-                if test is None:
-                    return
-                test.run()
-
     def __init__(self, nb_threads: int, verbose: str):
         self.nb_threads: int
         if nb_threads == -1:
-            self.nb_threads = psutil.cpu_count(logical=True) or nb_threads
+            # Use the CPUs this process may run on, which honors taskset and container limits
+            if hasattr(os, 'sched_getaffinity'):
+                self.nb_threads = len(os.sched_getaffinity(0))
+            else:
+                self.nb_threads = os.cpu_count() or 1
         else:
             self.nb_threads = nb_threads
 
         self.nb_commands_failed: int = 0
         self.nb_pending_commands: int = 0
         self.lock: threading.Lock = threading.Lock()
-        self.condition: threading.Condition = threading.Condition(self.lock)
+        # Set when there is nothing left to wait for, either because all commands are done
+        # or because one failed
+        self.done: threading.Event = threading.Event()
+        self.done.set()
         self.verbose: str = verbose
-        self.threads: list[threading.Thread] = []
-        self.queue: queue.Queue[CommandInterface|None] = queue.Queue()
-
-        for _ in range(0, self.nb_threads):
-            thread = Builder.BuilderWorker(self)
-            self.threads.append(thread)
-            thread.start()
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=self.nb_threads)
 
     def stop(self):
-        for thread in self.threads:
-            self.queue.put(None)
-        for thread in self.threads:
-            thread.join()
+        # Waits for the commands still running, the ones which have not started yet are
+        # skipped if a command failed.
+        self.executor.shutdown(wait=True)
 
 
     def push_command(self, command: CommandInterface):
+        self.push_commands([command])
+
+    def push_commands(self, commands: list[CommandInterface]):
+        # Commands unblocked together are accounted under a single lock hold
+        if len(commands) == 0:
+            return
         _ = self.lock.acquire()
-        self.nb_pending_commands += 1
-        self.queue.put(command)
+        if self.nb_commands_failed > 0:
+            # The build is aborted, don't start anything new
+            self.lock.release()
+            return
+        self.nb_pending_commands += len(commands)
+        self.done.clear()
         self.lock.release()
-
-    def pop_command(self) -> CommandInterface|None:
-        return self.queue.get()
+        for command in commands:
+            _ = self.executor.submit(self.__run_command, command)
+
+    def __run_command(self, command: CommandInterface):
+        # Once a command has failed, the build is aborted and the commands still queued are
+        # dropped without being executed.
+        if self.nb_commands_failed > 0:
+            return
+        try:
+            command.run()
+        except Exception:
+            # The executor would keep the exception in the discarded future, report it and
+            # abort the build, otherwise the command never completes and the build waits forever.
+            traceback.print_exc()
+            _ = self.lock.acquire()
+            self.nb_commands_failed += 1
+            self.done.set()
+            self.lock.release()
 
     def command_done(self, command: CommandInterface):
         _ = self.lock.acquire()
@@ -98,18 +105,12 @@ class Builder():
             self.nb_commands_failed += 1
         self.nb_pending_commands -= 1
 
-        self.condition.notify_all()
+        # Commands push the commands they trigger before reporting completion, so the
+        # counter only reaches 0 once the whole build is done.
+        if self.nb_pending_commands == 0 or self.nb_commands_failed > 0:
+            self.done.set()
         self.lock.release()
 
     def wait_completion(self):
-        _ = self.lock.acquire()
-        while self.nb_pending_commands > 0:
-            _ = self.condition.wait()
-
-            if self.nb_commands_failed > 0:
-                while not self.queue.empty():
-                    _ = self.queue.get()
-                self.nb_pending_commands = 0
-
-        self.lock.release()
+        _ = self.done.wait()
         return self.nb_commands_failed
@@ -25,10 +25,10 @@ import sys
 import os.path
 import logging
 import importlib.util
-import shutil
 import subprocess
 import argparse
-import dataclasses
+import weakref
+from types import ModuleType
 try:
     from typing import override  # Python 3.12+
 except ImportError:
@@ -43,30 +43,37 @@ from gvrun.target import Target
 from gvrun.systree import SystemTreeNode
 from config_tree import Config
 
-commands = [
-    ['commands'    , 'Show the list of available commands'],
-    ['config'      , 'Show the target configuration'],
-    ['targets'     , 'Show the list of available targets'],
-    ['image'       , 'Generate the target images needed to run execution'],
-    ['flash'       , 'Upload the flash contents to the target'],
-    ['flash_layout', 'Dump the layout of all flash memories'],
-    ['tree'        , 'Dump the tree of attributes, parameters and parameters'],
-    ['run'         , 'Start execution on the target'],
-    ['clean'       , 'Remove work directory'],
-    ['compile'     , 'Build executables for the target'],
-    ['build'       , 'Execute the commands image, flash and compile'],
-    ['all'         , 'Execute the commands build and run'],
-    ['target_gen'  , 'Generate files required for compiling target'],
-    ['diagram'     , 'Generate a Graphviz architecture diagram of the target'],
-]
-
-# True if we should generate components
-comp_generate = True
+commands = (
+    ('commands'    , 'Show the list of available commands'),
+    ('config'      , 'Show the target configuration'),
+    ('targets'     , 'Show the list of available targets'),
+    ('image'       , 'Generate the target images needed to run execution'),
+    ('flash'       , 'Upload the flash contents to the target'),
+    ('flash_layout', 'Dump the layout of all flash memories'),
+    ('tree'        , 'Dump the tree of attributes, parameters and parameters'),
+    ('run'         , 'Start execution on the target'),
+    ('clean'       , 'Remove work directory'),
+    ('compile'     , 'Build executables for the target'),
+    ('build'       , 'Execute the commands image, flash and compile'),
+    ('all'         , 'Execute the commands build and run'),
+    ('target_gen'  , 'Generate files required for compiling target'),
+    ('diagram'     , 'Generate a Graphviz architecture diagram of the target'),
+)
+
+_commands_help = '\n'.join(['Available commands:'] +
+    [f'  {name:16s} {desc}' for name, desc in commands])
+
+def _get_build_dir(args: argparse.Namespace) -> str:
+    # handle_commands stores it in args, other callers may only provide the work directory
+    build_dir = getattr(args, 'build_dir', None)
+    if build_dir is None:
+        return os.path.join(args.work_dir, 'build')
+    return build_dir
 
 def load_config(target: SystemTreeNode|None, args: argparse.Namespace):
     if target is not None:
         _ = BuildParameter(target, 'platform', args.platform, 'Platform providing the target')
-        _ = BuildParameter(target, 'builddir', os.path.join(args.work_dir, 'build'), 'Build directory')
+        _ = BuildParameter(target, 'builddir', _get_build_dir(args), 'Build directory')
 
         if not getattr(args, 'no_config_py', False) and os.path.exists('config.py'):
             module = import_config('config.py')
@@ -219,23 +226,29 @@ def apply_flash_cli_overrides(target: SystemTreeNode, args: argparse.Namespace):
         flash.parse_content()
 
 
+# --tree-format items enabling each part of the tree dump, in the order expected by
+# process_and_dump_tree
+_tree_format_filters = (
+    frozenset({'all', 'attr'}),
+    frozenset({'all', 'build'}),
+    frozenset({'all', 'target'}),
+    frozenset({'all', 'attr'}),
+    frozenset({'all', 'prop'}),
+)
+
 def dump_tree(target: Target, args: argparse.Namespace):
 
-    options = set(args.tree_format.split(':'))
+    options = args.tree_format.split(':')
 
     target.process_and_dump_tree(
-        len({'all', 'attr'} & options) > 0,
-        len({'all', 'build'} & options) > 0,
-        len({'all', 'target'} & options) > 0,
-        len({'all', 'attr'} & options) > 0,
-        len({'all', 'prop'} & options) > 0
+        *(not items.isdisjoint(options) for items in _tree_format_filters)
     )
 
 
 def compile(target: Target, args: argparse.Namespace):
     builder = Builder(args.jobs, args.verbose)
     try:
-        target.compile_all(builder, os.path.join(args.work_dir, 'build'))
+        target.compile_all(builder, _get_build_dir(args))
     except:
         builder.stop()
         raise
@@ -288,14 +301,24 @@ def _find_gvsoc_component(node):
     return None
 
 
-_flash_images_generated = False
+# Directories where each target already generated its files, so that chained commands (e.g.
+# "image run") only generate them once, while another target or directory still gets its own.
+_generated_build_dirs: weakref.WeakKeyDictionary[Target, set[str]] = weakref.WeakKeyDictionary()
+_generated_flash_dirs: weakref.WeakKeyDictionary[Target, set[str]] = weakref.WeakKeyDictionary()
+
+def _mark_generated(generated: weakref.WeakKeyDictionary[Target, set[str]], target: Target,
+        path: str) -> bool:
+    """Record that target generated files in path, return False if it was already done."""
+    paths = generated.setdefault(target, set())
+    if path in paths:
+        return False
+    paths.add(path)
+    return True
 
 def generate_flash_images(target: Target, args: argparse.Namespace):
     """Generate flash images for all non-empty registered flashes."""
-    global _flash_images_generated
-    if _flash_images_generated:
+    if not _mark_generated(_generated_flash_dirs, target, args.work_dir):
         return
-    _flash_images_generated = True
 
     systree = target.get_systree() or target
     flashes = systree.get_flashes()
@@ -305,69 +328,62 @@ def generate_flash_images(target: Target, args: argparse.Namespace):
 
 
 def __print_available_commands():
-    print('Available commands:')
+    print(_commands_help)
 
-    for command in commands:
-        print(f'  {command[0]:16s} {command[1]}')
+def _print_commands(target: Target, args: argparse.Namespace):
+    __print_available_commands()
 
-def handle_command(target: Target, command: str, args: argparse.Namespace):
-    global comp_generate
+def _dump_config(target: Target, args: argparse.Namespace):
+    target.config.dump()
 
-    if target.handle_command(command, args):
-        return
+def _clean(target: Target, args: argparse.Namespace):
+    import shutil
+    shutil.rmtree(_get_build_dir(args), ignore_errors=True)
 
-    if command == 'commands':
-        __print_available_commands()
-        return
+def _generate_images(target: Target, args: argparse.Namespace):
+    build_dir = _get_build_dir(args)
+    if _mark_generated(_generated_build_dirs, target, build_dir):
+        target.generate_all(build_dir)
+    generate_flash_images(target, args)
 
-    if command == 'config':
-        target.config.dump()
-        return
+def _run(target: Target, args: argparse.Namespace):
+    _generate_images(target, args)
+    _ = target.run(args)
 
-    if command == 'clean':
-        shutil.rmtree(os.path.join(args.work_dir, 'build'), ignore_errors=True)
-        return
+def _dump_flash_layout(target: Target, args: argparse.Namespace):
+    systree = target.get_systree() or target
+    for flash in systree.get_flashes().values():
+        level = getattr(args, 'flash_layout_level', 0) or 0
+        flash.dump_layout(level)
+
+def _target_gen(target: Target, args: argparse.Namespace):
+    target.target_gen_walk(_get_build_dir(args))
+
+# Steps executed for each command, in order
+_command_handlers = {
+    'commands'    : (_print_commands,),
+    'config'      : (_dump_config,),
+    'clean'       : (_clean,),
+    'tree'        : (dump_tree,),
+    'compile'     : (compile,),
+    'image'       : (_generate_images,),
+    'run'         : (_run,),
+    'build'       : (compile, _generate_images),
+    'all'         : (compile, _run),
+    'flash_layout': (_dump_flash_layout,),
+    'target_gen'  : (_target_gen,),
+    'diagram'     : (generate_diagram_cmd,),
+}
+
+def handle_command(target: Target, command: str, args: argparse.Namespace):
 
-    if command == 'tree':
-        dump_tree(target, args)
+    # Target-specific commands (e.g. components, flash) are handled here by the target or its
+    # runner, there is no need to ask it again afterwards.
+    if target.handle_command(command, args):
         return
 
-    if command in ['compile', 'all', 'build']:
-        compile(target, args)
-        if command == 'compile':
-            return
-
-    if command in ['image', 'all', 'build']:
-        if comp_generate:
-            comp_generate = False
-            target.generate_all(os.path.join(args.work_dir, 'build'))
-        generate_flash_images(target, args)
-        if command == 'image':
-            return
-
-    if command in ['run', 'all']:
-        if comp_generate:
-            comp_generate = False
-            target.generate_all(os.path.join(args.work_dir, 'build'))
-        generate_flash_images(target, args)
-        _ = target.run(args)
-        if command == 'run':
-            return
-
-    if command in ['components', 'flash']:
-        _ = target.handle_command(command, args)
-
-    if command == 'flash_layout':
-        systree = target.get_systree() or target
-        for flash in systree.get_flashes().values():
-            level = getattr(args, 'flash_layout_level', 0) or 0
-            flash.dump_layout(level)
-
-    if command == 'target_gen':
-        target.target_gen_walk(os.path.join(args.work_dir, 'build'))
-
-    if command == 'diagram':
-        generate_diagram_cmd(target, args)
+    for handler in _command_handlers.get(command, ()):
+        handler(target, args)
 
 def parse_parameter_arg_values(parameters: list[str]):
     set_parameters(parameters)
@@ -405,6 +421,9 @@ def handle_commands(target: Target, args: argparse.Namespace):
 
     commands = args.command
 
+    # Computed once here, all commands then refer to it
+    args.build_dir = os.path.join(args.work_dir, 'build')
+
     target._set_active_args(args)
 
     load_config(target.get_systree(), args)
@@ -438,18 +457,29 @@ class Command(CommandInterface,ABC):
 
     def command_done(self):
         if self.retval == 0:
+            ready: list[Command] = []
             for command in self.trigger_commands:
                 command.trigger_count -= 1
                 if command.trigger_count == 0:
-                    self.builder.push_command(command)
+                    ready.append(command)
+            self.builder.push_commands(ready)
 
     def execute(self, cmd: str, path: str|None=None):
         if self.builder.verbose == 'debug':
             print (cmd, flush=True)
 
-        proc = subprocess.run(cmd.split(), cwd=path, text=True, capture_output=True)
-        _ = sys.stdout.write(proc.stdout)
-        _ = sys.stderr.write(proc.stderr)
+        if self.builder.nb_threads == 1:
+            # Commands run one at a time, their output can go straight to the terminal
+            # instead of being buffered.
+            _ = sys.stdout.flush()
+            _ = sys.stderr.flush()
+            proc = subprocess.run(cmd.split(), cwd=path)
+        else:
+            # Capture the output so that outputs of commands running in parallel are not
+            # interleaved.
+            proc = subprocess.run(cmd.split(), cwd=path, text=True, capture_output=True)
+            _ = sys.stdout.write(proc.stdout)
+            _ = sys.stderr.write(proc.stderr)
         self.retval: int = proc.returncode
         self.command_done()
         self.builder.command_done(self)
@@ -488,6 +518,10 @@ def add_subdirectory(name: str, target: Target):
     module.declare(target)
 
 
+# Config modules already executed, indexed by their real path, so that a config.py reached
+# several times (e.g. through add_subdirectory) is only executed once.
+_config_modules: dict[str, ModuleType] = {}
+
 def import_config(name: str):
 
     logging.debug(f'Importing config (name: {name})')
@@ -495,15 +529,24 @@ def import_config(name: str):
     if not os.path.isabs(name):
         name = os.path.join(os.getcwd(), name)
 
+    realpath = os.path.realpath(name)
+    module = _config_modules.get(realpath)
+    if module is not None:
+        return module
+
     try:
         spec = importlib.util.spec_from_file_location(name, name)
         if spec is None or spec.loader is None:
             raise RuntimeError(f"Unable to load spec for {name}")
         module = importlib.util.module_from_spec(spec)
-        sys.modules["module.name"] = module
+        # Register the module under its own (path-based) name, a shared key would make each
+        # config.py replace the previous one.
+        sys.modules[name] = module
         spec.loader.exec_module(module)
 
     except FileNotFoundError:
         raise RuntimeError('Unable to open test configuration file: ' + name)
 
+    _config_modules[realpath] = module
+
     return module
@@ -40,14 +40,18 @@ import json
 import enum
 import os
 from dataclasses import fields, is_dataclass, dataclass, field
-from typing import Any, cast, get_args, get_origin
+from typing import Any, Callable, cast, get_args, get_origin
 from dataclasses import MISSING
 try:
     from typing import override  # Python 3.12+
 except ImportError:
     from typing_extensions import override  # Python 3.10–3.11
 
-__attribute_arg_values: dict[str, str] = {}
+# Overrides grouped by the path of the Config they apply to including the trailing '/', then by
+# field name, so that a Config only looks up its own path instead of one path per field
+__attribute_arg_values: dict[str, dict[str, str]] = {}
+# True once at least one override was registered, lets Config skip override lookups otherwise
+_has_attribute_arg_values: bool = False
 
 def set_attributes(attributes: list[str]) -> None:
     """
@@ -67,11 +71,13 @@ def set_attributes(attributes: list[str]) -> None:
         ...     "debug/enabled=true"
         ... ])
     """
-    global __attribute_arg_values
+    global __attribute_arg_values, _has_attribute_arg_values
 
     for prop in attributes:
         key, value = prop.split('=', 1)
-        __attribute_arg_values[key] = value
+        parent_path, sep, name = key.rpartition('/')
+        __attribute_arg_values.setdefault(parent_path + sep, {})[name] = value
+        _has_attribute_arg_values = True
 
 
 @dataclass
@@ -119,37 +125,23 @@ class Config:
         2. For each field marked with init=True, checks for command-line overrides
         3. Casts override values to the appropriate type and updates the field
         """
-        if self.parent is not None and self.name is not None:
-            parent_path = self.parent.__get_path()
-            if parent_path is not None and parent_path != '':
-                self.path = parent_path + '/' + self.name
-            else:
-                self.path = self.name
-        else:
-            self.path = ''
+        parent = self.parent
+        name = self.name
+        path = self.path = ('' if parent is None or name is None else
+            parent.path + '/' + name if parent.path else name)
 
-        for f in fields(self):
-            path = self.__get_path()
-            if path is not None:
-                path = path + '/' + f.name
-            else:
-                path = f.name
+        if not _has_attribute_arg_values:
+            return
 
-            if f.init:
-                cmd_value = _get_attribute_arg_value(path)
-                if cmd_value is not None:
-                    casted = _cast_to_type(cmd_value, f.type)
-                    setattr(self, f.name, casted)
+        overrides = _get_attribute_arg_values(path + '/')
+        if overrides is None:
+            return
 
-
-    def __get_path(self) -> str | None:
-        """
-        Get the hierarchical path of this configuration node.
-
-        Returns:
-            The computed path string (e.g., "parent/child/field").
-        """
-        return self.path
+        init_fields = _get_init_fields(type(self))
+        for field_name, cmd_value in overrides.items():
+            if field_name in init_fields:
+                casted = _cast_to_type(cmd_value, init_fields[field_name])
+                setattr(self, field_name, casted)
 
     @override
     def __repr__(self) -> str:
@@ -163,16 +155,14 @@ class Config:
             String like "ClassName(field1=value1, field2=0x1234_5678)".
         """
         parts: list[str] = []
-        for f in fields(self):
-            if f.repr and hasattr(self, f.name):
-                if f.metadata.get("inlined_dump") == True:
-                    value = getattr(self, f.name)
-                    fmt = f.metadata.get("format")
+        for name, fmt in _get_repr_fields(type(self)):
+            if hasattr(self, name):
+                value = getattr(self, name)
 
-                    if fmt == "hex" and isinstance(value, int):
-                        value = _hex_grouped(value)
+                if fmt == "hex" and isinstance(value, int):
+                    value = _hex_grouped(value)
 
-                    parts.append(f"{f.name}={value}")
+                parts.append(f"{name}={value}")
 
         return f"{self.__class__.__name__}({', '.join(parts)})"
 
@@ -658,17 +648,55 @@ def cfg_field(
     return field(default=default, init=init, metadata=md)
 
 
-def _get_attribute_arg_value(name: str) -> str | None:
+# Per-class field descriptions, computed on first use as dataclass fields do not change once
+# the class is created.
+_init_fields: dict[type, dict[str, Any]] = {}
+_repr_fields: dict[type, tuple[tuple[str, Any], ...]] = {}
+
+def _get_init_fields(cls: type) -> dict[str, Any]:
     """
-    Retrieve a command-line attribute override value by path.
+    Get the fields of a Config class which can be overridden from the command-line.
 
     Args:
-        name: The hierarchical path to the attribute (e.g., "system/cpu/frequency").
+        cls: The Config dataclass.
 
     Returns:
-        The string value if found, None otherwise.
+        Dict of field name to type annotation for each field with init=True.
     """
-    return __attribute_arg_values.get(name)
+    result = _init_fields.get(cls)
+    if result is None:
+        result = {f.name: f.type for f in fields(cls) if f.init}
+        _init_fields[cls] = result
+    return result
+
+def _get_repr_fields(cls: type) -> tuple[tuple[str, Any], ...]:
+    """
+    Get the fields of a Config class which are shown by its repr.
+
+    Args:
+        cls: The Config dataclass.
+
+    Returns:
+        Tuple of (name, format metadata) for each field with repr=True and inlined_dump=True.
+    """
+    result = _repr_fields.get(cls)
+    if result is None:
+        result = tuple((f.name, f.metadata.get("format")) for f in fields(cls)
+            if f.repr and f.metadata.get("inlined_dump") == True)
+        _repr_fields[cls] = result
+    return result
+
+def _get_attribute_arg_values(path: str) -> dict[str, str] | None:
+    """
+    Retrieve the command-line attribute overrides of a configuration node.
+
+    Args:
+        path: The hierarchical path of the node followed by '/' (e.g., "system/cpu/").
+
+    Returns:
+        Dict of field name to string value if any override targets this node, None otherwise.
+    """
+    return __attribute_arg_values.get(path)
 
 def _hex_grouped(value: int, group: int = 4) -> str:
     """
@@ -762,73 +790,120 @@ def _cast_to_type(value: Any, typ: Any) -> Any:
     if value is None:
         return None
 
+    try:
+        caster = _casters.get(typ)
+    except TypeError:
+        # Unhashable annotation, cast it without caching
+        return _build_caster(typ)(value)
+
+    if caster is None:
+        caster = _build_caster(typ)
+        _casters[typ] = caster
+    return caster(value)
+
+# Casting functions per type annotation, built on first use so that the annotation is only
+# inspected once
+_casters: dict[Any, Callable[[Any], Any]] = {}
+
+def _cast_int(value: Any) -> int:
+    # supports hex like "0x8000_0000"
+    return int(str(value).replace("_", ""), 0)
+
+def _build_caster(typ: Any) -> Callable[[Any], Any]:
+    """
+    Build the function casting a non-None value to a type annotation.
+
+    Args:
+        typ: The target type annotation (can be generic, union, etc.).
+
+    Returns:
+        Function taking the value to cast and returning it cast, as described in _cast_to_type.
+
+    Raises:
+        ValueError: If a sequence annotation has more than one type argument.
+    """
     origin = get_origin(typ)
     args = get_args(typ)
 
     # list[T], set[T], tuple[T, ...]
     if origin in (list, set, tuple):
         (elem_t,) = args if args else (str,)
-        if isinstance(value, str):
-            s = value.strip()
-            # Support JSON arrays: '[1,2,3]'
-            if s.startswith("["):
-                items = json.loads(s)
+
+        def cast_sequence(value: Any) -> Any:
+            if isinstance(value, str):
+                s = value.strip()
+                # Support JSON arrays: '[1,2,3]'
+                if s.startswith("["):
+                    items = json.loads(s)
+                else:
+                    # Fallback: comma-separated: '1,2,3'
+                    items = [x.strip() for x in s.split(",") if x.strip() != ""]
             else:
-                # Fallback: comma-separated: '1,2,3'
-                items = [x.strip() for x in s.split(",") if x.strip() != ""]
-        else:
-            items = list(value)
-
-        casted = [_cast_to_type(x, elem_t) for x in items]
-        if origin is list:
-            return casted
-        if origin is set:
-            return set(casted)
-        return tuple(casted)
+                items = list(value)
+
+            casted = [_cast_to_type(x, elem_t) for x in items]
+            if origin is list:
+                return casted
+            if origin is set:
+                return set(casted)
+            return tuple(casted)
+
+        return cast_sequence
 
     # dict[K, V] (expect JSON)
     if origin is dict:
-        if not isinstance(value, str):
-            return value
-        return json.loads(value)
+        def cast_dict(value: Any) -> Any:
+            if not isinstance(value, str):
+                return value
+            return json.loads(value)
+
+        return cast_dict
 
     # Enums
     if isinstance(typ, type) and issubclass(typ, enum.Enum):
-        if isinstance(value, typ):
-            return value
-        # allow both "NAME" and raw value
-        s = str(value)
-        try:
-            return typ[s]
-        except KeyError:
-            # try constructor on the enum value
-            return typ(_cast_to_type(s, type(next(iter(typ)).value)))
+        def cast_enum(value: Any) -> Any:
+            if isinstance(value, typ):
+                return value
+            # allow both "NAME" and raw value
+            s = str(value)
+            try:
+                return typ[s]
+            except KeyError:
+                # try constructor on the enum value
+                return typ(_cast_to_type(s, type(next(iter(typ)).value)))
+
+        return cast_enum
 
     # Nested dataclass (expect JSON object)
     if isinstance(typ, type) and is_dataclass(typ):
-        if isinstance(value, typ):
-            return value
-        if not isinstance(value, str):
-            raise ValueError(f"Expected JSON string for {typ.__name__}, got {type(value)}")
-        data = json.loads(value)
-        if not isinstance(data, dict):
-            raise ValueError(f"Expected JSON object for {typ.__name__}, got {data!r}")
-        return typ(**data)
+        def cast_dataclass(value: Any) -> Any:
+            if isinstance(value, typ):
+                return value
+            if not isinstance(value, str):
+                raise ValueError(f"Expected JSON string for {typ.__name__}, got {type(value)}")
+            data = json.loads(value)
+            if not isinstance(data, dict):
+                raise ValueError(f"Expected JSON object for {typ.__name__}, got {data!r}")
+            return typ(**data)
+
+        return cast_dataclass
 
     # Primitives / fallbacks
     if typ is bool:
-        return _parse_bool(value)
+        return _parse_bool
     if typ is int:
-        # supports hex like "0x8000_0000"
-        return int(str(value).replace("_", ""), 0)
+        return _cast_int
     if typ is float:
-        return float(value)
+        return float
     if typ is str:
-        return str(value)
+        return str
+
+    def cast_other(value: Any) -> Any:
+        # If it's already the right type, keep it
+        if isinstance(value, typ):
+            return value
 
-    # If it's already the right type, keep it
-    if isinstance(value, typ):
-        return value
+        # Last resort: call the type
+        return cast(Any, typ(value))
 
-    # Last resort: call the type
-    return cast(Any, typ(value))
+    return cast_other
@@ -256,19 +256,18 @@ class FlashSection:
 
     def get_image(self) -> bytes:
         """Return the binary content of this section, padded to size."""
-        result = bytearray()
-        for cstruct in self.structs:
-            result += cstruct.pack()
+        chunks = [cstruct.pack() for cstruct in self.structs]
 
-        image_len = len(result)
+        image_len = sum(len(chunk) for chunk in chunks)
         section_size = self.get_size()
         if image_len < section_size:
-            result += bytearray(section_size - image_len)
+            chunks.append(bytes(section_size - image_len))
         elif image_len > section_size:
             raise RuntimeError(
                 f'Section "{self.name}" image is too big '
                 f'(expected {section_size}, got {image_len})')
-        return bytes(result)
+        # Single copy of the pieces, or none at all if the section is made of one block
+        return b''.join(chunks)
 
     def is_empty(self) -> bool:
         """Return True if this section has no meaningful content."""
@@ -532,24 +531,35 @@ class Flash:
             section.finalize()
 
         # Phase 3: write binary
-        image = self._pack()
         os.makedirs(workdir, exist_ok=True)
         image_path = os.path.join(workdir, self.get_image_basename())
-        with open(image_path, 'wb') as f:
-            f.write(image)
-
-    def _pack(self) -> bytes:
-        """Pack all sections into a contiguous binary."""
-        result = bytearray()
+        # Written to a temporary file first so that a section failing to pack does not leave a
+        # truncated image in place of the previous one
+        tmp_path = image_path + '.tmp'
+        # Opened outside the try so that an error creating the file is reported as is
+        f = open(tmp_path, 'wb')
+        try:
+            with f:
+                self._write_image(f)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, image_path)
+
+    def _write_image(self, f):
+        """Write all sections to *f* as a contiguous binary.
+
+        Sections are streamed one by one so that the whole image is never
+        materialized in memory.
+        """
         prev_end = 0
         for section in self.sections:
             # Insert padding for gaps between sections
             gap = section.get_offset() - prev_end
             if gap > 0:
-                result += bytearray(gap)
-            result += section.get_image()
+                f.write(bytes(gap))
+            f.write(section.get_image())
             prev_end = section.get_offset() + section.get_size()
-        return bytes(result)
 
     def get_image_path(self) -> str | None:
         """Return the path of the generated image file."""
@@ -51,10 +51,7 @@ class PartitionTableSection(FlashSection):
 
     def build(self):
         # Capture the sections that come after this one in the flash.
-        flash = self.get_flash()
-        all_sections = flash.get_sections()
-        idx = all_sections.index(self)
-        self._followers = all_sections[idx + 1:]
+        self._followers = self._get_followers()
 
         top = CStructParent('partition_table', parent=self)
         # 4-byte pointer at the very start of the flash, read by PMSIS to
@@ -73,39 +70,46 @@ class PartitionTableSection(FlashSection):
         # 4-byte pointer at the start of this section.
         self._pointer.set_field('table_offset', self._header.get_offset())
 
-        self._header.set_field('magic_number', _PARTITION_TABLE_HEADER_MAGIC)
-        self._header.set_field('partition_table_version', _PARTITION_TABLE_FORMAT_VERSION)
         self._header.set_field('nb_entries', len(self._followers))
 
+        # Magic numbers and format version are constants set when the
+        # structures are built.
         for entry, section in zip(self._entries, self._followers):
-            entry.set_field('magic_number', _PARTITION_ENTRY_MAGIC)
-            entry.set_field('type', section.get_partition_type())
-            entry.set_field('subtype', section.get_partition_subtype())
-            entry.set_field('offset', section.get_offset())
-            entry.set_field('size', section.get_size())
-            entry.set_field('name', section.get_name().encode('utf-8') + b'\x00')
+            entry.set_fields(
+                type=section.get_partition_type(),
+                subtype=section.get_partition_subtype(),
+                offset=section.get_offset(),
+                size=section.get_size(),
+                name=section.get_name().encode('utf-8') + b'\x00')
 
     def is_empty(self) -> bool:
-        flash = self.get_flash()
-        if flash is None:
-            return True
-        all_sections = flash.get_sections()
-        try:
-            idx = all_sections.index(self)
-        except ValueError:
-            return True
         # The table is only meaningful if at least one following section has
         # content to advertise.
-        for section in all_sections[idx + 1:]:
+        for section in self._get_followers():
             if not section.is_empty():
                 return False
         return True
 
+    def _get_followers(self) -> list[FlashSection]:
+        """Return the sections laid out after this one in its flash.
+
+        The section id is the position assigned by ``Flash.add_section``, so
+        no scan of the section list is needed to locate this section.
+        """
+        flash = self.get_flash()
+        if flash is None:
+            return []
+        all_sections = flash.sections
+        idx = self.get_id()
+        if idx >= len(all_sections) or all_sections[idx] is not self:
+            return []
+        return all_sections[idx + 1:]
+
 
 def _make_header(parent: CStructParent) -> CStruct:
     hdr = CStruct('header', parent)
-    hdr.add_field('magic_number', 'H')
-    hdr.add_field('partition_table_version', 'B')
+    hdr.add_field('magic_number', 'H', _PARTITION_TABLE_HEADER_MAGIC)
+    hdr.add_field('partition_table_version', 'B', _PARTITION_TABLE_FORMAT_VERSION)
     hdr.add_field('nb_entries', 'B')
     hdr.add_field('crc', 'B')
     hdr.add_field_array('padding', 11)
@@ -115,7 +119,7 @@ def _make_header(parent: CStructParent) -> CStruct:
 
 def _make_entry(parent: CStructParent, index: int) -> CStruct:
     entry = CStruct(f'entry_{index}', parent)
-    entry.add_field('magic_number', 'H')
+    entry.add_field('magic_number', 'H', _PARTITION_ENTRY_MAGIC)
     entry.add_field('type', 'B')
     entry.add_field('subtype', 'B')
     entry.add_field('offset', 'I')
@@ -22,12 +22,23 @@
 
 
 from collections import OrderedDict
+import functools
 import os
 import struct
+import zlib
 from prettytable import PrettyTable
 from typing import Any
 
 
+@functools.lru_cache(maxsize=256)
+def _get_struct(fmt: str) -> struct.Struct:
+    """Return the compiled struct for a format, shared by all structures using it.
+
+    Many structures of an image have the same layout (partition entries, file headers, ...),
+    so the format only needs to be compiled once.
+    """
+    return struct.Struct(fmt)
+
 def write_if_changed(path: str, content: str) -> bool:
     """Write ``content`` to ``path`` only if it differs from the existing file.
 
@@ -63,10 +74,16 @@ def compute_crc(init : int, buff: bytes):
     crc : int
         crc of the scalar bytes
     """
+    if 0 <= init <= 0xffffffff:
+        # This is the standard reflected CRC-32 (polynomial 0xEDB88320). zlib applies the
+        # pre/post inversion itself and expects the previous CRC, hence the inverted init.
+        return zlib.crc32(buff, init ^ 0xffffffff)
+
+    # zlib only handles 32 bits init values, keep the bitwise computation for the others
     crc = init
-    for _, data in enumerate(buff):
+    for data in buff:
         crc = crc ^ data
-        for _ in range(7, -1, -1):
+        for _ in range(8):
             if crc & 1 == 1:
                 mask = 0xffffffff
             else:
@@ -90,6 +107,9 @@ class CStructField():
         Offset of this field in the flash.
     """
 
+    # One instance per field of every structure in a flash image, keep them small
+    __slots__ = ('name', 'size', 'value', '__offset')
+
     def __init__(self, name: str, size: int, value: Any, offset: int):
         self.name: str = name
         self.size: int = size
@@ -123,6 +143,8 @@ class CStructScalar(CStructField):
     Class for scalar fields.
     """
 
+    __slots__ = ()
+
     def dump_table(self, table: PrettyTable, level: int):
         """Dump the field to a table.
 
@@ -157,6 +179,8 @@ class CStructArray(CStructField):
     Class for scalar fields.
     """
 
+    __slots__ = ()
+
     def dump_table(self, table: PrettyTable, level: int):
         """Dump the field to a table.
 
@@ -303,6 +327,21 @@ class CStruct():
             field.set(value)
 
 
+    def set_fields(self, **values: Any):
+        """Set several field values at once.
+
+        Same semantics as calling set_field for each keyword argument, useful for filling
+        a whole header in one call.
+
+        Parameters
+        ----------
+        values : Any
+            Field values, keyed by field name
+        """
+        for name, value in values.items():
+            self.set_field(name, value)
+
+
     def add_padding(self, name: str, align: int):
         """An empty field for padding.
 
@@ -328,7 +367,7 @@ class CStruct():
 
 
 
-    def add_field(self, name: str, field_format: str) -> CStructField:
+    def add_field(self, name: str, field_format: str, value: int = 0) -> CStructField:
         """Add a scalar field.
 
         The field is added to the structure. The fields are dumped in the order they are added.
@@ -339,6 +378,8 @@ class CStruct():
             Name of the field
         field_format: str
             Format of the field, described by struct python package
+        value: int
+            Initial value of the field, so that constant fields do not need a later set_field
 
         Returns
         -------
@@ -349,7 +390,7 @@ class CStruct():
         offset = self.parent.alloc_offset(size)
 
 
-        field = CStructScalar(name, size, value=0, offset=offset)
+        field = CStructScalar(name, size, value=value, offset=offset)
         self.fields[name] = field
 
         self.format += field_format
@@ -419,8 +460,16 @@ class CStruct():
         bytes
             The values of the fields packed into a byte array.
         """
+        # Data blocks (file contents, binaries) are a single array field whose value usually
+        # has exactly the field size. Emit it as-is rather than copying it through struct.
+        if len(self.fields) == 1:
+            field = next(iter(self.fields.values()))
+            if isinstance(field, CStructArray) and isinstance(field.value, bytes) and \
+                    len(field.value) == field.size:
+                return field.value
+
         if self.struct is None:
-            self.struct = struct.Struct(self.format)
+            self.struct = _get_struct(self.format)
 
         values: list[Any] = []
         for field in self.fields.values():